@@ -0,0 +1,10 @@
+import os
+import sys
+
+# adding `src` dir to PYTHON_PATH for importing modules
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from cli import main  # noqa: E402
+
+
+sys.exit(main())
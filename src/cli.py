@@ -0,0 +1,323 @@
+"""
+Command-line batch runner
+
+Usage:
+    python -m src NETWORK [--queries FILE] [--output FILE] [--profile [FILE]]
+
+NETWORK - JSON file with road network:
+    {
+        "points": [{"name": "1", "price": "3.00"}, {"name": "4"}, ...],
+        "roads": [{"from": "1", "to": "4", "length": "30"}, ...]
+    }
+    point without `price` has no gas station
+
+Queries - JSONL (one JSON object per line), from stdin by default:
+    {"from": "1", "to": "5", "across": ["4"], "volume": "40"}
+    `across` and `volume` are optional (`volume` - truck's `min_volume`)
+
+Results - JSONL, one line per query, written as soon as query is solved:
+    {"query": {...}, "route": [...], "refuels": [...], "cost": "...",
+     "stats": {...}}
+    or {"query": {...}, "error": "...", "stats": {...}}
+"""
+import argparse
+import cProfile
+import contextlib
+import json
+import math
+import os
+import pstats
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+
+from type_hints import Iterable, Tuple
+from roadmap import Road, RoadMap, GasStation, MapPoint
+from route import Route, RouteManager, RouteFuelManager
+from truck import Truck, TruckState
+from pathfinder import find_path, NoSolution
+
+
+"""
+Functions, which timings are reported separately with `--profile`
+"""
+HOT_PATH = (
+    ('RouteManager.move', RouteManager.move),
+    ('RouteFuelManager.move', RouteFuelManager.move),
+)
+
+
+class BadNetwork(Exception):
+    pass
+
+
+class BadQuery(Exception):
+    pass
+
+
+def parse_amount(value) -> Decimal:
+    """
+    Parse finite non-negative number (price, length, volume)
+
+    :raises ValueError
+    """
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite() or amount < 0:
+        raise ValueError('bad number {0!r}'.format(value))
+    return amount
+
+
+def parse_finite_float(value: str) -> float:
+    """
+    Parse JSON number of query, output stays standard JSON
+
+    :raises ValueError
+    """
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError('non-finite number {0}'.format(value))
+    return number
+
+
+def reject_constant(value: str):
+    """ :raises ValueError for JSON extensions `NaN`, `Infinity` """
+    raise ValueError('non-standard constant {0}'.format(value))
+
+
+def load_roadmap(fp) -> Tuple[RoadMap, dict]:
+    """
+    Load RoadMap from JSON file-object `fp`
+
+    :returns roadmap and dict {name: MapPoint}
+    :raises BadNetwork
+    """
+    try:
+        data = json.load(fp, parse_float=Decimal)
+    except ValueError as ex:
+        raise BadNetwork('Invalid network JSON: {0}'.format(ex))
+    try:
+        points = {}
+        for point in data.get('points', ()):
+            price = point.get('price')
+            points[point['name']] = MapPoint(
+                name=point['name'],
+                gas_station=(
+                    GasStation(price=parse_amount(price))
+                    if price is not None else None
+                ),
+            )
+        roadmap = RoadMap()
+        for road in data.get('roads', ()):
+            try:
+                point_from = points[road['from']]
+                point_to = points[road['to']]
+            except KeyError as ex:
+                raise BadNetwork(
+                    'Unknown point {0} in road {1}'.format(ex, road))
+            roadmap.add_edge(point_from, point_to, Road(
+                length=parse_amount(road['length']),
+                point_from=point_from,
+                point_to=point_to,
+            ))
+    except KeyError as ex:
+        raise BadNetwork('Missing field {0} in network'.format(ex))
+    except ValueError as ex:
+        raise BadNetwork('Bad network: {0}'.format(ex))
+    except (TypeError, AttributeError) as ex:
+        raise BadNetwork('Bad network: {0!r}'.format(ex))
+    return roadmap, points
+
+
+def dump_route(route: Route) -> dict:
+    """ make JSON-serializable answer from solution route """
+    return {
+        'route': [rp.map_point.name for rp in route.route_points],
+        'refuels': [
+            {'point': refuel.route_point.map_point.name,
+             'volume': str(refuel.volume)}
+            for refuel in route.route_fuel_pool.refuel_list
+            if refuel.volume
+        ],
+        'cost': str(route.cost),
+    }
+
+
+def get_point(points: dict, name) -> MapPoint:
+    """ :raises BadQuery """
+    try:
+        return points[name]
+    except (KeyError, TypeError):
+        raise BadQuery('unknown point {0!r}'.format(name))
+
+
+def parse_query(points: dict, truck: Truck, query) -> dict:
+    """
+    Make `find_path` arguments from query
+
+    :raises BadQuery
+    """
+    if not isinstance(query, dict):
+        raise BadQuery('query must be JSON object')
+    for field in ('from', 'to'):
+        if field not in query:
+            raise BadQuery('missing field {0!r}'.format(field))
+    across = query.get('across', ())
+    if not isinstance(across, (list, tuple)):
+        raise BadQuery('`across` must be list')
+    try:
+        volume = parse_amount(query.get('volume', truck.min_volume))
+    except ValueError:
+        raise BadQuery('bad volume {0!r}'.format(query['volume']))
+    return dict(
+        from_point=get_point(points, query['from']),
+        to_point=get_point(points, query['to']),
+        across_points=[get_point(points, name) for name in across],
+        truckstate=TruckState(truck=truck, volume=volume),
+    )
+
+
+def solve_query(
+        roadmap: RoadMap,
+        points: dict,
+        truck: Truck,
+        line: str,
+) -> dict:
+    """ solve query from one input line, errors are reported in answer """
+    started = time.perf_counter()
+    try:
+        query = json.loads(
+            line,
+            parse_float=parse_finite_float,
+            parse_constant=reject_constant,
+        )
+    except ValueError:
+        query = line.rstrip('\n')
+        answer = {'query': query, 'error': 'invalid JSON'}
+    else:
+        answer = {'query': query}
+        try:
+            route = find_path(roadmap=roadmap, **parse_query(
+                points, truck, query))
+        except BadQuery as ex:
+            answer['error'] = str(ex)
+        except NoSolution:
+            answer['error'] = 'no solution'
+        except ArithmeticError as ex:
+            answer['error'] = 'solver error: {0!r}'.format(ex)
+        else:
+            answer.update(dump_route(route))
+            answer['stats'] = {'points': route.length}
+    answer.setdefault('stats', {})['time'] = time.perf_counter() - started
+    return answer
+
+
+def solve_stream(
+        roadmap: RoadMap,
+        points: dict,
+        truck: Truck,
+        lines: Iterable[str],
+        output,
+        solver_log,
+) -> int:
+    """
+    Solve queries from `lines` one by one, writing every answer
+    to `output` immediately, bad line gives answer with error
+
+    `solver_log` - file-object for `find_path` messages
+
+    :returns count of processed queries
+    """
+    count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        with contextlib.redirect_stdout(solver_log):
+            answer = solve_query(roadmap, points, truck, line)
+        output.write(json.dumps(answer) + '\n')
+        output.flush()
+        count += 1
+    return count
+
+
+def report_profile(profile: cProfile.Profile, path: str, stream) -> None:
+    """
+    Write `pstats` output (or dump it to `path`) and hot-path timings
+    """
+    stats = pstats.Stats(profile, stream=stream)
+    if path == '-':
+        stats.sort_stats('cumulative').print_stats(30)
+    else:
+        stats.dump_stats(path)
+    stream.write('Hot path:\n')
+    for name, func in HOT_PATH:
+        code = func.__code__
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        _, ncalls, tottime, cumtime, _ = stats.stats.get(
+            key, (0, 0, 0, 0, None))
+        stream.write(
+            '{0}: calls={1} tottime={2:.6f}s cumtime={3:.6f}s\n'.format(
+                name, ncalls, tottime, cumtime))
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src',
+        description='Solve minimal-cost-path queries as a stream',
+    )
+    parser.add_argument(
+        'network', type=argparse.FileType('r'),
+        help='JSON file with road network')
+    parser.add_argument(
+        '--queries', type=argparse.FileType('r'), default='-',
+        help='JSONL file with queries (stdin by default)')
+    parser.add_argument(
+        '--output', type=argparse.FileType('w'), default='-',
+        help='JSONL file for results (stdout by default)')
+    parser.add_argument('--capacity', type=Decimal, default=Decimal(500))
+    parser.add_argument('--min-volume', type=Decimal, default=Decimal(40))
+    parser.add_argument('--mpg', type=Decimal, default=Decimal(24))
+    parser.add_argument(
+        '--profile', nargs='?', const='-', metavar='FILE',
+        help='profile solving: print `pstats` to stderr '
+             'or dump them to FILE; hot-path timings go to stderr')
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help='write searching messages to stderr')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = make_parser().parse_args(argv)
+    with args.network:
+        try:
+            roadmap, points = load_roadmap(args.network)
+        except BadNetwork as ex:
+            sys.stderr.write('{0}\n'.format(ex))
+            return 1
+    truck = Truck(
+        capacity=args.capacity,
+        min_volume=args.min_volume,
+        mpg=args.mpg,
+    )
+    profile = cProfile.Profile() if args.profile else None
+    with contextlib.ExitStack() as stack:
+        solver_log = (
+            sys.stderr if args.verbose
+            else stack.enter_context(open(os.devnull, 'w')))
+        if profile:
+            profile.enable()
+        try:
+            solve_stream(
+                roadmap, points, truck,
+                lines=args.queries,
+                output=args.output,
+                solver_log=solver_log,
+            )
+        finally:
+            if profile:
+                profile.disable()
+                report_profile(profile, args.profile, sys.stderr)
+    return 0
@@ -0,0 +1,217 @@
+import time
+from collections import namedtuple, OrderedDict, deque
+
+from type_hints import Iterable, Numeric
+from roadmap import RoadMap, MapPoint
+from route import Route
+from truck import Truck, TruckState
+from pathfinder import find_path, NoSolution
+from structures.graph import UniDirectionalGraph
+
+
+FleetRequest = namedtuple('FleetRequest', (
+    'truckstate',  # TruckState
+    'from_point',  # MapPoint
+    'to_point',  # MapPoint
+    'across_points',  # Iterable[MapPoint]
+))
+"""
+Truck-dependent data, derived from MapIndex
+"""
+TruckProfile = namedtuple('TruckProfile', (
+    'truck',  # Truck
+    'fuel_range',  # Numeric - max length of road for truck with full tank
+))
+FleetStats = namedtuple('FleetStats', (
+    'requests',  # int
+    'solved',  # int
+    'time',  # float - seconds
+    'throughput',  # float - requests per second
+))
+FleetReport = namedtuple('FleetReport', (
+    'routes',  # Iterable[Route|None] - in order of requests
+    'truck_stats',  # dict {Truck: FleetStats}
+    'stats',  # FleetStats
+))
+
+
+class PrunedRoadMap:
+    """
+    View of RoadMap only with roads not longer than `fuel_range`
+    and leading to points from `reachable`, nothing is copied
+    """
+
+    def __init__(self, roadmap: RoadMap, reachable: frozenset,
+                 fuel_range: Numeric):
+        self.roadmap = roadmap
+        self.reachable = reachable
+        self.fuel_range = fuel_range
+
+    def iter_neighbors(self, node):
+        for node_to, road in self.roadmap.iter_neighbors(node):
+            if node_to in self.reachable and road.length <= self.fuel_range:
+                yield node_to, road
+
+
+class MapIndex:
+    """
+    Truck-independent indexes of RoadMap, built once per map
+
+    Store:
+        * reversed roadmap
+        * points, from which destination is reachable
+          (lazy, per destination, last `cache_size` destinations)
+    """
+
+    def __init__(self, roadmap: RoadMap, cache_size: int = 1024):
+        self.roadmap = roadmap
+        self.reversed_graph = UniDirectionalGraph()
+        for point_from, point_to, road in roadmap.iter_edges():
+            self.reversed_graph.add_edge(point_to, point_from, road)
+        self.cache_size = cache_size
+        self._reachable = OrderedDict()
+
+    def reachable_to(self, to_point: MapPoint) -> frozenset:
+        """
+        All points, from which `to_point` is reachable
+        (BFS over reversed roadmap)
+        """
+        if to_point in self._reachable:
+            self._reachable.move_to_end(to_point)
+            return self._reachable[to_point]
+        reachable = {to_point}
+        queue = deque((to_point,))
+        while queue:
+            point = queue.popleft()
+            for point_from, _ in self.reversed_graph.iter_neighbors(point):
+                if point_from not in reachable:
+                    reachable.add(point_from)
+                    queue.append(point_from)
+        reachable = frozenset(reachable)
+        self._reachable[to_point] = reachable
+        if len(self._reachable) > self.cache_size:
+            self._reachable.popitem(last=False)
+        return reachable
+
+    @staticmethod
+    def make_profile(truck: Truck) -> TruckProfile:
+        return TruckProfile(truck=truck, fuel_range=truck.capacity * truck.mpg)
+
+    def truck_roadmap(
+            self,
+            profile: TruckProfile,
+            truckstate: TruckState,
+            to_point: MapPoint,
+    ) -> PrunedRoadMap:
+        """
+        RoadMap only with roads, which truck with `truckstate` can drive
+        and which lead to `to_point`
+
+        Truck can't use more fuel on one road than full tank
+        or its start fuel, if it is greater
+        """
+        start_range = (
+            (truckstate.volume - profile.truck.min_volume) *
+            profile.truck.mpg)
+        return PrunedRoadMap(
+            roadmap=self.roadmap,
+            reachable=self.reachable_to(to_point),
+            fuel_range=max(profile.fuel_range, start_range),
+        )
+
+
+class FleetPlanner:
+    """
+    Planner for requests of many trucks on the same RoadMap
+
+    Logic:
+    * build MapIndex once
+    * for every request:
+       * reject it without searching, if `to_point` is unreachable
+         from `from_point` or any of `across_points`
+       * search on view of roadmap, pruned for truck and destination
+    * collect per-truck and aggregated throughput
+    """
+
+    def __init__(self, roadmap: RoadMap):
+        self.index = MapIndex(roadmap)
+        self.profiles = {}
+
+    def profile(self, truck: Truck) -> TruckProfile:
+        if truck not in self.profiles:
+            self.profiles[truck] = self.index.make_profile(truck)
+        return self.profiles[truck]
+
+    def find_path(
+            self,
+            from_point: MapPoint,
+            to_point: MapPoint,
+            across_points: Iterable[MapPoint],
+            truckstate: TruckState,
+    ) -> Route:
+        """
+        Same as `pathfinder.find_path` but using shared indexes
+
+        :raises NoSolution
+        """
+        across_points = tuple(across_points)
+        reachable = self.index.reachable_to(to_point)
+        if any(p not in reachable for p in (from_point,) + across_points):
+            raise NoSolution
+        return find_path(
+            roadmap=self.index.truck_roadmap(
+                self.profile(truckstate.truck), truckstate, to_point),
+            from_point=from_point,
+            to_point=to_point,
+            across_points=across_points,
+            truckstate=truckstate,
+        )
+
+    def solve(self, requests: Iterable[FleetRequest]) -> FleetReport:
+        """
+        Solve all requests, route is None if request has no solution
+        """
+        routes = []
+        counters = {}
+        started = time.perf_counter()
+        for request in requests:
+            request_started = time.perf_counter()
+            try:
+                route = self.find_path(
+                    from_point=request.from_point,
+                    to_point=request.to_point,
+                    across_points=request.across_points,
+                    truckstate=request.truckstate,
+                )
+            except NoSolution:
+                route = None
+            routes.append(route)
+            requests_count, solved, spent = counters.get(
+                request.truckstate.truck, (0, 0, 0))
+            counters[request.truckstate.truck] = (
+                requests_count + 1,
+                solved + (route is not None),
+                spent + time.perf_counter() - request_started,
+            )
+        truck_stats = {
+            truck: self.make_stats(*counter)
+            for truck, counter in counters.items()
+        }
+        return FleetReport(
+            routes=routes,
+            truck_stats=truck_stats,
+            stats=self.make_stats(
+                requests=len(routes),
+                solved=sum(s.solved for s in truck_stats.values()),
+                spent=time.perf_counter() - started,
+            ),
+        )
+
+    @staticmethod
+    def make_stats(requests: int, solved: int, spent: float) -> FleetStats:
+        return FleetStats(
+            requests=requests,
+            solved=solved,
+            time=spent,
+            throughput=requests / spent if spent else 0,
+        )
@@ -11,12 +11,18 @@ class NoSolution(Exception):
     pass
 
 
+class SearchCancelled(Exception):
+    pass
+
+
 def find_path(
         roadmap: RoadMap,
         from_point: MapPoint,
         to_point: MapPoint,
         across_points: Iterable[MapPoint],
         truckstate: TruckState,
+        cancel_event=None,
+        cancel_check_interval: int = 1,
 ):
     """
     Find minimal-cost-path on map `roadmap` from `from_point` to `to_point`
@@ -27,8 +33,17 @@ def find_path(
     * while exist available routes to development - develop them
     * when available routes ends - get low-cost-route from completed
 
+    `cancel_event` - optional object with `is_set()` method
+    (`threading.Event`, `multiprocessing.Event`), checked before
+    developing every `cancel_check_interval`-th route - if set,
+    searching stops
+
     :raises NoSolution
+    :raises SearchCancelled
+    :raises ValueError
     """
+    if cancel_check_interval < 1:
+        raise ValueError('cancel_check_interval must be positive')
     manager = RouteManager(
         to_point=to_point,
         across_points=across_points,
@@ -40,8 +55,16 @@ def find_path(
         start_fuel_vol=truckstate.volume - truckstate.truck.min_volume
     )
 
+    iteration = 0
     try:
         while True:
+            if (
+                cancel_event is not None and
+                iteration % cancel_check_interval == 0 and
+                cancel_event.is_set()
+            ):
+                raise SearchCancelled
+            iteration += 1
             route = manager.pop_available()
             for mp, road in roadmap.iter_neighbors(route.end):
                 try:
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from functools import partial
+from multiprocessing import Manager
+
+from type_hints import Iterable, Numeric
+from roadmap import RoadMap
+from route import MapPoint
+from truck import TruckState
+from pathfinder import find_path
+
+
+class InFlightSearch:
+    """
+    One running `find_path` call shared by all identical requests
+    """
+
+    def __init__(self, future: asyncio.Future, cancel_event):
+        self.future = future
+        self.cancel_event = cancel_event
+        self.waiters = 0
+
+
+class PlanningService:
+    """
+    Asyncio-facing wrapper around `find_path`
+
+    Logic:
+    * every search runs in `executor` (threads by default),
+      so event loop is never blocked
+    * identical concurrent requests wait for the same in-flight search
+    * if all waiters of search are gone (cancelled or timed out) -
+      search is stopped via its cancel-event
+    * cancel-event of process executor is a `Manager` proxy, every check
+      of it is a round trip, so it is checked only every
+      `PROCESS_CANCEL_CHECK_INTERVAL`-th searching iteration
+    """
+
+    PROCESS_CANCEL_CHECK_INTERVAL = 100
+
+    def __init__(
+            self,
+            executor: Executor = None,
+            timeout: Numeric = None,
+    ):
+        self.executor = executor or ThreadPoolExecutor()
+        self.timeout = timeout
+        self.in_flight = {}
+        self._manager = None
+
+    @property
+    def uses_processes(self) -> bool:
+        return isinstance(self.executor, ProcessPoolExecutor)
+
+    def _make_cancel_event(self):
+        """ make event, which can be checked by executor's worker """
+        if self.uses_processes:
+            if self._manager is None:
+                self._manager = Manager()
+            return self._manager.Event()
+        return threading.Event()
+
+    @staticmethod
+    def make_key(
+            roadmap: RoadMap,
+            from_point: MapPoint,
+            to_point: MapPoint,
+            across_points: Iterable[MapPoint],
+            truckstate: TruckState,
+    ):
+        """ key of request - identical requests have equal keys """
+        return (
+            id(roadmap),
+            from_point,
+            to_point,
+            frozenset(across_points),
+            truckstate,
+        )
+
+    def _submit(self, key, **kwargs) -> InFlightSearch:
+        loop = asyncio.get_event_loop()
+        cancel_event = self._make_cancel_event()
+        future = loop.run_in_executor(
+            self.executor,
+            partial(
+                find_path,
+                cancel_event=cancel_event,
+                cancel_check_interval=(
+                    self.PROCESS_CANCEL_CHECK_INTERVAL
+                    if self.uses_processes else 1),
+                **kwargs
+            ),
+        )
+        in_flight = InFlightSearch(future=future, cancel_event=cancel_event)
+        self.in_flight[key] = in_flight
+        future.add_done_callback(lambda f: self._forget(key, in_flight))
+        return in_flight
+
+    def _forget(self, key, in_flight: InFlightSearch) -> None:
+        if self.in_flight.get(key) is in_flight:
+            del self.in_flight[key]
+
+    def _release(self, key, in_flight: InFlightSearch) -> None:
+        """ stop search if nobody waits for it """
+        in_flight.waiters -= 1
+        if in_flight.waiters or in_flight.future.done():
+            return
+        self._forget(key, in_flight)
+        in_flight.cancel_event.set()
+        in_flight.future.cancel()
+
+    async def plan(
+            self,
+            roadmap: RoadMap,
+            from_point: MapPoint,
+            to_point: MapPoint,
+            across_points: Iterable[MapPoint],
+            truckstate: TruckState,
+            timeout: Numeric = None,
+    ):
+        """
+        Find minimal-cost-path (see `find_path`) without blocking event loop
+
+        `timeout` - seconds to wait for result,
+        `PlanningService.timeout` by default
+
+        :raises NoSolution
+        :raises asyncio.TimeoutError
+        """
+        across_points = tuple(across_points)
+        key = self.make_key(
+            roadmap, from_point, to_point, across_points, truckstate)
+        in_flight = self.in_flight.get(key)
+        if in_flight is None:
+            in_flight = self._submit(
+                key,
+                roadmap=roadmap,
+                from_point=from_point,
+                to_point=to_point,
+                across_points=across_points,
+                truckstate=truckstate,
+            )
+        in_flight.waiters += 1
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(in_flight.future), timeout)
+        finally:
+            self._release(key, in_flight)
+
+    def close(self) -> None:
+        """ stop all in-flight searches and release executor """
+        for in_flight in list(self.in_flight.values()):
+            in_flight.cancel_event.set()
+            in_flight.future.cancel()
+        self.in_flight.clear()
+        self.executor.shutdown(wait=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
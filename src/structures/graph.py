@@ -11,4 +11,9 @@ class UniDirectionalGraph:
 
     def iter_neighbors(self, node):
         for node_to, edge in self._graph[node].items():
-            yield node_to, edge
\ No newline at end of file
+            yield node_to, edge
+
+    def iter_edges(self):
+        for node_from, neighbors in self._graph.items():
+            for node_to, edge in neighbors.items():
+                yield node_from, node_to, edge
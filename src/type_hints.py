@@ -1,4 +1,4 @@
-from typing import TypeVar, Iterable
+from typing import TypeVar, Iterable, Tuple
 from decimal import Decimal
 
 Numeric = TypeVar('Numeric', int, Decimal)
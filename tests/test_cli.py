@@ -0,0 +1,130 @@
+import io
+import json
+from decimal import Decimal
+
+from cli import main, reject_constant
+
+
+NETWORK = {
+    'points': [
+        {'name': '1', 'price': '3.00'},
+        {'name': '2', 'price': '3.17'},
+        {'name': '3'},
+        {'name': '4'},
+        {'name': '5'},
+    ],
+    'roads': [
+        {'from': '1', 'to': '2', 'length': 10},
+        {'from': '1', 'to': '5', 'length': 100},
+        {'from': '1', 'to': '4', 'length': 30},
+        {'from': '2', 'to': '3', 'length': 50},
+        {'from': '4', 'to': '3', 'length': 20},
+        {'from': '4', 'to': '5', 'length': 60},
+        {'from': '3', 'to': '5', 'length': 10},
+    ],
+}
+
+QUERIES = [
+    {'from': '1', 'to': '5'},
+    {'from': '5', 'to': '1'},
+]
+
+
+def run_cli(tmpdir, *options, lines=None):
+    network = tmpdir.join('network.json')
+    network.write(json.dumps(NETWORK))
+    queries = tmpdir.join('queries.jsonl')
+    if lines is None:
+        lines = [json.dumps(q) for q in QUERIES]
+    queries.write(''.join(line + '\n' for line in lines))
+    output = tmpdir.join('output.jsonl')
+    assert main([
+        str(network),
+        '--queries', str(queries),
+        '--output', str(output),
+    ] + list(options)) == 0
+    return [
+        json.loads(line, parse_constant=reject_constant)
+        for line in output.readlines()
+    ]
+
+
+def test_batch(tmpdir):
+    solved, unsolved = run_cli(tmpdir)
+    assert solved['query'] == QUERIES[0]
+    assert solved['route'] == ['1', '4', '3', '5']
+    assert [
+        (refuel['point'], Decimal(refuel['volume']))
+        for refuel in solved['refuels']
+    ] == [('1', Decimal(60)/Decimal(24))]
+    assert Decimal(solved['cost']) == Decimal(60)/Decimal(24) * Decimal('3.00')
+    assert solved['stats']['points'] == 4
+    assert unsolved['query'] == QUERIES[1]
+    assert unsolved['error'] == 'no solution'
+
+
+def test_profile(tmpdir, monkeypatch):
+    stderr = io.StringIO()
+    monkeypatch.setattr('sys.stderr', stderr)
+    assert len(run_cli(tmpdir, '--profile')) == len(QUERIES)
+    report = stderr.getvalue()
+    assert 'Ordered by: cumulative time' in report
+    assert 'RouteManager.move: calls=' in report
+    assert 'RouteFuelManager.move: calls=' in report
+
+
+def test_bad_queries(tmpdir):
+    answers = run_cli(tmpdir, lines=[
+        json.dumps(QUERIES[0]),
+        'not json',
+        '[1]',
+        json.dumps({'from': '1', 'to': '5', 'volume': 'abc'}),
+        json.dumps({'from': '1', 'to': '9'}),
+        json.dumps({'from': '1', 'to': '5', 'volume': 'NaN'}),
+        json.dumps({'from': '1', 'to': '5', 'volume': 'sNaN'}),
+        json.dumps({'from': '1', 'to': '5', 'volume': 'Infinity'}),
+        json.dumps({'from': '1', 'to': '5', 'volume': -5}),
+        '{"from": "1", "to": "5", "volume": 1e400}',
+        '{"from": "1", "to": "5", "volume": NaN}',
+        json.dumps(QUERIES[0]),
+    ])
+    assert [answer.get('error') for answer in answers] == [
+        None,
+        'invalid JSON',
+        'query must be JSON object',
+        "bad volume 'abc'",
+        "unknown point '9'",
+        "bad volume 'NaN'",
+        "bad volume 'sNaN'",
+        "bad volume 'Infinity'",
+        "bad volume -5",
+        'invalid JSON',
+        'invalid JSON',
+        None,
+    ]
+    assert answers[1]['query'] == 'not json'
+    assert answers[-1]['route'] == ['1', '4', '3', '5']
+    assert all('time' in answer['stats'] for answer in answers)
+
+
+def test_bad_network(tmpdir, monkeypatch):
+    stderr = io.StringIO()
+    monkeypatch.setattr('sys.stderr', stderr)
+    network = tmpdir.join('network.json')
+    for data in [
+        '{',
+        json.dumps({'points': [{'price': '3.00'}]}),
+        json.dumps({'points': [{'name': '1'}],
+                    'roads': [{'from': '1', 'to': '1'}]}),
+        json.dumps({'points': [{'name': '1'}],
+                    'roads': [{'from': '1', 'to': '2', 'length': 1}]}),
+        json.dumps({'points': [{'name': '1'}],
+                    'roads': [{'from': '1', 'to': '1', 'length': 'NaN'}]}),
+        json.dumps({'points': [{'name': '1'}],
+                    'roads': [{'from': '1', 'to': '1', 'length': -1}]}),
+        json.dumps({'points': [{'name': '1', 'price': 'Infinity'}]}),
+        json.dumps({'points': [{'name': '1', 'price': '-3.00'}]}),
+    ]:
+        network.write(data)
+        assert main([str(network), '--queries', str(network)]) == 1
+    assert len(stderr.getvalue().splitlines()) == 8
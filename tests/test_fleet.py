@@ -0,0 +1,136 @@
+import random
+from decimal import Decimal
+
+from roadmap import Road, RoadMap, GasStation, MapPoint
+from route import RoutePoint
+from truck import Truck, TruckState
+from pathfinder import find_path, NoSolution
+from fleet import FleetPlanner, FleetRequest
+
+
+def test_fleet():
+    roadmap = RoadMap()
+
+    MP1 = MapPoint(name='1', gas_station=GasStation(price=Decimal('3.00')))
+    MP2 = MapPoint(name='2', gas_station=GasStation(price=Decimal('3.17')))
+    MP3 = MapPoint(name='3', gas_station=None)
+    MP4 = MapPoint(name='4', gas_station=None)
+    MP5 = MapPoint(name='5', gas_station=None)
+
+    roadmap.add_edge(MP1, MP2, Road(Decimal(10), point_from=MP1, point_to=MP2))
+    roadmap.add_edge(MP1, MP5, Road(Decimal(100), point_from=MP1, point_to=MP5))
+    roadmap.add_edge(MP1, MP4, Road(Decimal(30), point_from=MP1, point_to=MP4))
+    roadmap.add_edge(MP2, MP3, Road(Decimal(50), point_from=MP2, point_to=MP3))
+    roadmap.add_edge(MP4, MP3, Road(Decimal(20), point_from=MP4, point_to=MP3))
+    roadmap.add_edge(MP4, MP5, Road(Decimal(60), point_from=MP4, point_to=MP5))
+    roadmap.add_edge(MP3, MP5, Road(Decimal(10), point_from=MP3, point_to=MP5))
+
+    big_truck = Truck(
+        capacity=Decimal(500),
+        min_volume=Decimal(40),
+        mpg=Decimal(24)
+    )
+    # can't drive roads longer than 25 miles
+    small_truck = Truck(
+        capacity=Decimal(5),
+        min_volume=Decimal(1),
+        mpg=Decimal(5)
+    )
+    requests = [
+        FleetRequest(
+            truckstate=TruckState(truck=big_truck, volume=Decimal(40)),
+            from_point=MP1, to_point=MP5, across_points=()),
+        FleetRequest(
+            truckstate=TruckState(truck=small_truck, volume=Decimal(5)),
+            from_point=MP1, to_point=MP5, across_points=()),
+        FleetRequest(
+            truckstate=TruckState(truck=small_truck, volume=Decimal(5)),
+            from_point=MP2, to_point=MP5, across_points=()),
+        FleetRequest(
+            truckstate=TruckState(truck=big_truck, volume=Decimal(40)),
+            from_point=MP5, to_point=MP1, across_points=()),
+    ]
+
+    planner = FleetPlanner(roadmap)
+    report = planner.solve(requests)
+
+    assert report.routes == baseline_routes(roadmap, requests)
+    assert report.routes[0].route_points == (
+        RoutePoint(MP1, 1),
+        RoutePoint(MP4, 2),
+        RoutePoint(MP3, 3),
+        RoutePoint(MP5, 4),
+    )
+    assert report.routes[1] is None
+    assert report.routes[2] is None
+    assert report.routes[3] is None
+
+    assert report.truck_stats[big_truck].requests == 2
+    assert report.truck_stats[big_truck].solved == 1
+    assert report.truck_stats[small_truck].requests == 2
+    assert report.truck_stats[small_truck].solved == 0
+    assert report.stats.requests == 4
+    assert report.stats.solved == 1
+    # truck-independent indexes are built once per destination
+    assert planner.index.reachable_to(MP5) is planner.index.reachable_to(MP5)
+    assert planner.index.reachable_to(MP5) == {MP1, MP2, MP3, MP4, MP5}
+
+
+def test_fleet_random():
+    rnd = random.Random(7)
+    for _ in range(50):
+        points = [
+            MapPoint(name=str(i), gas_station=(
+                GasStation(price=Decimal(rnd.randint(1, 5)))
+                if i == 0 or rnd.random() < 0.5 else None))
+            for i in range(6)
+        ]
+        roadmap = RoadMap()
+        # only forward roads - no cycles
+        for i, point_from in enumerate(points):
+            for point_to in points[i + 1:]:
+                if rnd.random() < 0.4:
+                    roadmap.add_edge(point_from, point_to, Road(
+                        Decimal(rnd.randint(1, 20)),
+                        point_from=point_from, point_to=point_to))
+        requests = []
+        for _ in range(5):
+            truck = Truck(
+                capacity=Decimal(rnd.randint(1, 4)),
+                min_volume=Decimal(1),
+                mpg=Decimal(rnd.randint(2, 6)),
+            )
+            # start point always has gas station
+            from_index = rnd.choice([
+                i for i, point in enumerate(points[:5])
+                if point.gas_station])
+            requests.append(FleetRequest(
+                truckstate=TruckState(
+                    truck=truck, volume=Decimal(rnd.randint(1, 8))),
+                from_point=points[from_index],
+                to_point=points[rnd.randint(from_index + 1, 5)],
+                across_points=(),
+            ))
+        report = FleetPlanner(roadmap).solve(requests)
+        assert report.routes == baseline_routes(roadmap, requests)
+
+
+def baseline_routes(roadmap, requests):
+    routes = []
+    for request in requests:
+        try:
+            routes.append(find_path(
+                roadmap=roadmap,
+                from_point=request.from_point,
+                to_point=request.to_point,
+                across_points=request.across_points,
+                truckstate=request.truckstate,
+            ))
+        except NoSolution:
+            routes.append(None)
+    return routes
+
+
+if __name__ == '__main__':
+    test_fleet()
+    test_fleet_random()
@@ -0,0 +1,268 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+
+from roadmap import Road, RoadMap, GasStation, MapPoint
+from route import RoutePoint
+from truck import Truck, TruckState
+from pathfinder import find_path, SearchCancelled
+from planner import PlanningService
+
+
+MP1 = MapPoint(name='1', gas_station=GasStation(price=Decimal('3.00')))
+MP2 = MapPoint(name='2', gas_station=GasStation(price=Decimal('3.17')))
+MP3 = MapPoint(name='3', gas_station=None)
+MP4 = MapPoint(name='4', gas_station=None)
+MP5 = MapPoint(name='5', gas_station=None)
+
+TRUCKSTATE = TruckState(
+    truck=Truck(
+        capacity=Decimal(500),
+        min_volume=Decimal(40),
+        mpg=Decimal(24)
+    ),
+    volume=Decimal(40),
+)
+
+
+class SlowRoadMap(RoadMap):
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+
+    def iter_neighbors(self, node):
+        self.calls += 1
+        time.sleep(self.delay)
+        return super().iter_neighbors(node)
+
+
+class BlockingRoadMap(RoadMap):
+    """
+    Developing of first route is blocked until `release` is set
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def iter_neighbors(self, node):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return super().iter_neighbors(node)
+
+
+def fill_roadmap(roadmap):
+    roadmap.add_edge(MP1, MP2, Road(Decimal(10), point_from=MP1, point_to=MP2))
+    roadmap.add_edge(MP1, MP5, Road(Decimal(100), point_from=MP1, point_to=MP5))
+    roadmap.add_edge(MP1, MP4, Road(Decimal(30), point_from=MP1, point_to=MP4))
+    roadmap.add_edge(MP2, MP3, Road(Decimal(50), point_from=MP2, point_to=MP3))
+    roadmap.add_edge(MP4, MP3, Road(Decimal(20), point_from=MP4, point_to=MP3))
+    roadmap.add_edge(MP4, MP5, Road(Decimal(60), point_from=MP4, point_to=MP5))
+    roadmap.add_edge(MP3, MP5, Road(Decimal(10), point_from=MP3, point_to=MP5))
+    return roadmap
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def check_plan(service):
+    route = run(service.plan(
+        roadmap=fill_roadmap(RoadMap()),
+        from_point=MP1,
+        to_point=MP5,
+        across_points=(),
+        truckstate=TRUCKSTATE,
+    ))
+    service.close()
+    assert route.route_points == (
+        RoutePoint(MP1, 1),
+        RoutePoint(MP4, 2),
+        RoutePoint(MP3, 3),
+        RoutePoint(MP5, 4),
+    )
+    assert route.cost == Decimal(60)/Decimal(24) * Decimal('3.00')
+
+
+def test_plan():
+    check_plan(PlanningService(executor=ThreadPoolExecutor(max_workers=2)))
+
+
+def test_plan_in_processes():
+    check_plan(PlanningService(executor=ProcessPoolExecutor(max_workers=2)))
+
+
+def check_identical_requests_coalesced(service):
+    roadmap = fill_roadmap(SlowRoadMap(delay=0.01))
+
+    async def plan_twice():
+        return await asyncio.gather(*(
+            service.plan(
+                roadmap=roadmap,
+                from_point=MP1,
+                to_point=MP5,
+                across_points=across_points,
+                truckstate=TRUCKSTATE,
+            )
+            for across_points in [(MP4, MP3), (MP3, MP4)]
+        ))
+
+    route1, route2 = run(plan_twice())
+    service.close()
+    assert route1 is route2
+    assert not service.in_flight
+
+
+def test_identical_requests_coalesced():
+    check_identical_requests_coalesced(
+        PlanningService(executor=ThreadPoolExecutor(max_workers=2)))
+
+
+def test_identical_requests_coalesced_in_processes():
+    check_identical_requests_coalesced(
+        PlanningService(executor=ProcessPoolExecutor(max_workers=2)))
+
+
+async def wait_started(roadmap):
+    while not roadmap.started.is_set():
+        await asyncio.sleep(0.001)
+
+
+def plan_blocked(service, roadmap, timeout=None):
+    return service.plan(
+        roadmap=roadmap,
+        from_point=MP1,
+        to_point=MP5,
+        across_points=(),
+        truckstate=TRUCKSTATE,
+        timeout=timeout,
+    )
+
+
+def test_cancel_stops_search():
+    service = PlanningService(executor=ThreadPoolExecutor(max_workers=1))
+    roadmap = fill_roadmap(BlockingRoadMap())
+
+    async def plan_and_cancel():
+        task = asyncio.ensure_future(plan_blocked(service, roadmap))
+        await wait_started(roadmap)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+
+    assert run(plan_and_cancel())
+    roadmap.release.set()
+    service.close()
+    # search stopped after first route development
+    assert roadmap.calls == 1
+
+
+def test_timeout_stops_search():
+    service = PlanningService(executor=ThreadPoolExecutor(max_workers=1))
+    roadmap = fill_roadmap(BlockingRoadMap())
+
+    async def plan_with_timeout():
+        first = asyncio.ensure_future(plan_blocked(service, roadmap))
+        await wait_started(roadmap)
+        # joins already running search, which has only this waiter
+        # after cancelling the first one
+        second = asyncio.ensure_future(
+            plan_blocked(service, roadmap, timeout=0.01))
+        await asyncio.sleep(0)
+        first.cancel()
+        try:
+            await second
+        except asyncio.TimeoutError:
+            return True
+
+    assert run(plan_with_timeout())
+    roadmap.release.set()
+    service.close()
+    # search stopped after first route development
+    assert roadmap.calls == 1
+
+
+def test_timeout_stops_search_in_processes():
+    # chain of 1000 points - searching takes about 10 seconds
+    points = [
+        MapPoint(name=str(i), gas_station=GasStation(price=Decimal(1)))
+        for i in range(1000)
+    ]
+    roadmap = SlowRoadMap(delay=0.01)
+    for point_from, point_to in zip(points, points[1:]):
+        roadmap.add_edge(point_from, point_to, Road(
+            Decimal(1), point_from=point_from, point_to=point_to))
+    service = PlanningService(executor=ProcessPoolExecutor(max_workers=1))
+
+    async def plan_with_timeout():
+        plan = asyncio.ensure_future(service.plan(
+            roadmap=roadmap,
+            from_point=points[0],
+            to_point=points[-1],
+            across_points=(),
+            truckstate=TRUCKSTATE,
+            timeout=1,
+        ))
+        await asyncio.sleep(0)
+        in_flight, = service.in_flight.values()
+        try:
+            await plan
+        except asyncio.TimeoutError:
+            return in_flight
+
+    in_flight = run(plan_with_timeout())
+    assert in_flight.cancel_event.is_set()
+    assert in_flight.future.cancelled()
+    started = time.perf_counter()
+    service.close()
+    # worker is stopped within PROCESS_CANCEL_CHECK_INTERVAL iterations
+    assert time.perf_counter() - started < 5
+
+
+def test_find_path_cancelled():
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    e = None
+    try:
+        find_path(
+            roadmap=fill_roadmap(RoadMap()),
+            from_point=MP1,
+            to_point=MP5,
+            across_points=(),
+            truckstate=TRUCKSTATE,
+            cancel_event=cancel_event,
+        )
+    except SearchCancelled as ex:
+        e = ex
+    assert e
+
+
+def test_find_path_bad_cancel_check_interval():
+    e = None
+    try:
+        find_path(
+            roadmap=fill_roadmap(RoadMap()),
+            from_point=MP1,
+            to_point=MP5,
+            across_points=(),
+            truckstate=TRUCKSTATE,
+            cancel_event=threading.Event(),
+            cancel_check_interval=0,
+        )
+    except ValueError as ex:
+        e = ex
+    assert e